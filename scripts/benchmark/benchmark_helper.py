@@ -4,11 +4,17 @@ Benchmark helper for Discord webhook service testing.
 Provides Ed25519 signing and Pub/Sub interaction utilities.
 """
 
+import base64
+import binascii
+import ctypes
+import ctypes.util
+import functools
 import hashlib
 import json
 import sys
+import threading
 import time
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 # Ed25519 signing using PyNaCl
 try:
@@ -18,6 +24,23 @@ except ImportError:
     print("ERROR: PyNaCl not installed. Run: pip install pynacl", file=sys.stderr)
     sys.exit(1)
 
+# Optional libsodium binding: signs detached without PyNaCl's wrapper objects
+try:
+    import pysodium
+except ImportError:
+    pysodium = None
+
+# Optional orjson: serializes straight to bytes, much faster than stdlib json
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
 # Google Cloud Pub/Sub
 try:
     from google.cloud import pubsub_v1
@@ -29,43 +52,151 @@ except ImportError:
 TEST_SEED = "discord-bot-test-suite-ed25519-test-key-seed-v1"
 
 
+@functools.lru_cache(maxsize=1)
 def get_test_keys() -> Tuple[SigningKey, str]:
     """
     Generate deterministic test key pair from fixed seed.
-    Returns (signing_key, public_key_hex).
+    Returns (signing_key, public_key_hex). The pair is derived once and cached.
     """
+    # SHA-256 is part of the shared key definition: changing it changes the public key
+    # hardcoded in CI, docker-compose and the Go test keys. It only runs once (cached).
     seed = hashlib.sha256(TEST_SEED.encode()).digest()
     signing_key = SigningKey(seed)
     public_key_hex = signing_key.verify_key.encode(encoder=HexEncoder).decode()
     return signing_key, public_key_hex
 
 
+@functools.lru_cache(maxsize=1)
+def get_secret_key_bytes() -> bytes:
+    """
+    Get the raw 64-byte libsodium secret key (seed || public key) for the test key pair.
+    """
+    signing_key, _ = get_test_keys()
+    return bytes(signing_key) + bytes(signing_key.verify_key)
+
+
+def _cpu_has_avx512ifma() -> bool:
+    """Check /proc/cpuinfo for the AVX-512 IFMA extension."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            return "avx512ifma" in f.read()
+    except OSError:
+        return False
+
+
+def _load_lib25519_sign() -> Optional[Callable[[bytes, bytes], bytes]]:
+    """
+    Load lib25519's Ed25519 sign via ctypes.
+    Returns a sign(message, secret_key) callable, or None if lib25519 is unavailable.
+    """
+    path = ctypes.util.find_library("25519")
+    if path is None:
+        return None
+
+    try:
+        lib = ctypes.CDLL(path)
+        sign_fn = lib.lib25519_sign_ed25519
+    except (OSError, AttributeError):
+        return None
+
+    # void lib25519_sign_ed25519(sm, &smlen, m, mlen, sk); sm = signature || message
+    sign_fn.argtypes = [
+        ctypes.c_char_p,
+        ctypes.POINTER(ctypes.c_longlong),
+        ctypes.c_char_p,
+        ctypes.c_longlong,
+        ctypes.c_char_p,
+    ]
+    sign_fn.restype = None
+
+    def sign(message: bytes, secret_key: bytes) -> bytes:
+        signed = ctypes.create_string_buffer(len(message) + 64)
+        signed_len = ctypes.c_longlong()
+        sign_fn(signed, ctypes.byref(signed_len), message, len(message), secret_key)
+        return signed.raw[:64]
+
+    return sign
+
+
+def _pysodium_sign(message: bytes, secret_key: bytes) -> bytes:
+    return pysodium.crypto_sign_detached(message, secret_key)
+
+
+def _pynacl_sign(message: bytes, secret_key: bytes) -> bytes:
+    signing_key, _ = get_test_keys()
+    return signing_key.sign(message).signature
+
+
+@functools.lru_cache(maxsize=1)
+def _sign_backend() -> Tuple[str, Callable[[bytes, bytes], bytes]]:
+    """
+    Pick the fastest available Ed25519 signer, on first use only so that
+    commands that don't sign skip the probe.
+    lib25519 is only used on AVX-512 IFMA hosts; elsewhere libsodium is as fast.
+    Returns (backend_name, sign(message, secret_key) callable).
+    """
+    if _cpu_has_avx512ifma():
+        lib25519_sign = _load_lib25519_sign()
+        if lib25519_sign is not None:
+            return "lib25519", lib25519_sign
+
+    if pysodium is not None:
+        return "pysodium", _pysodium_sign
+
+    return "pynacl", _pynacl_sign
+
+
+def sign_detached(message: bytes) -> bytes:
+    """
+    Sign a message with the test key.
+    Returns the 64-byte Ed25519 signature.
+    """
+    _, sign = _sign_backend()
+    return sign(message, get_secret_key_bytes())
+
+
 def sign_request(body: bytes, timestamp: Optional[str] = None) -> Tuple[str, str]:
     """
     Sign a Discord interaction request.
     Returns (signature_hex, timestamp).
     """
-    signing_key, _ = get_test_keys()
-
     if timestamp is None:
         timestamp = str(int(time.time()))
 
     # Discord signature format: sign(timestamp + body)
     message = timestamp.encode() + body
-    signed = signing_key.sign(message)
-    signature_hex = signed.signature.hex()
+    signature_hex = sign_detached(message).hex()
 
     return signature_hex, timestamp
 
 
+def sign_many(
+    bodies: List[bytes], timestamp: Optional[str] = None
+) -> List[Tuple[str, str]]:
+    """
+    Sign many Discord interaction requests with one shared timestamp.
+    Services reject timestamps 6 or more seconds old, so send the requests within ~5s.
+    Backend, key and timestamp lookups are hoisted out of the loop.
+    Returns [(signature_hex, timestamp), ...] in the order of bodies.
+    """
+    if timestamp is None:
+        timestamp = str(int(time.time()))
+
+    _, sign = _sign_backend()
+    secret_key = get_secret_key_bytes()
+    ts_bytes = timestamp.encode()
+
+    return [(sign(ts_bytes + body, secret_key).hex(), timestamp) for body in bodies]
+
+
 def create_ping_request() -> bytes:
     """Create a Discord ping interaction request body."""
-    return json.dumps({"type": 1}).encode()
+    return _dumps({"type": 1})
 
 
 def create_slash_command_request(command_name: str = "test-command") -> bytes:
     """Create a Discord slash command interaction request body."""
-    return json.dumps(
+    return _dumps(
         {
             "type": 2,
             "id": "123456789",
@@ -76,7 +207,22 @@ def create_slash_command_request(command_name: str = "test-command") -> bytes:
             "data": {"id": "cmd123", "name": command_name, "type": 1},
             "member": {"user": {"id": "user123", "username": "testuser"}},
         }
-    ).encode()
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_subscriber():
+    """
+    Get a shared Pub/Sub subscriber client.
+    Creating a client sets up gRPC channels, so one is reused across calls.
+    """
+    return pubsub_v1.SubscriberClient()
+
+
+@functools.lru_cache(maxsize=16)
+def get_subscription_path(project_id: str, subscription_name: str) -> str:
+    """Get the fully qualified subscription path."""
+    return pubsub_v1.SubscriberClient.subscription_path(project_id, subscription_name)
 
 
 def setup_pubsub(project_id: str, topic_name: str, subscription_name: str) -> bool:
@@ -90,10 +236,10 @@ def setup_pubsub(project_id: str, topic_name: str, subscription_name: str) -> bo
 
     try:
         publisher = pubsub_v1.PublisherClient()
-        subscriber = pubsub_v1.SubscriberClient()
+        subscriber = get_subscriber()
 
         topic_path = publisher.topic_path(project_id, topic_name)
-        subscription_path = subscriber.subscription_path(project_id, subscription_name)
+        subscription_path = get_subscription_path(project_id, subscription_name)
 
         # Create topic if not exists
         try:
@@ -130,8 +276,8 @@ def pull_message(
         return None
 
     try:
-        subscriber = pubsub_v1.SubscriberClient()
-        subscription_path = subscriber.subscription_path(project_id, subscription_name)
+        subscriber = get_subscriber()
+        subscription_path = get_subscription_path(project_id, subscription_name)
 
         response = subscriber.pull(
             request={"subscription": subscription_path, "max_messages": 1},
@@ -158,33 +304,45 @@ def pull_message(
         return None
 
 
-def clear_subscription(project_id: str, subscription_name: str) -> int:
+def clear_subscription(
+    project_id: str, subscription_name: str, idle_timeout: float = 1.0
+) -> int:
     """
     Clear all pending messages from a subscription.
+    Drains over a single StreamingPull stream until no message has arrived
+    for idle_timeout seconds.
     Returns number of messages cleared.
     """
     if pubsub_v1 is None:
         return 0
 
     count = 0
-    try:
-        subscriber = pubsub_v1.SubscriberClient()
-        subscription_path = subscriber.subscription_path(project_id, subscription_name)
+    last_received = time.monotonic()
+    lock = threading.Lock()
 
-        while True:
-            response = subscriber.pull(
-                request={"subscription": subscription_path, "max_messages": 100},
-                timeout=1.0,
-            )
+    def drain(message) -> None:
+        nonlocal count, last_received
+        message.ack()
+        with lock:
+            count += 1
+            last_received = time.monotonic()
 
-            if not response.received_messages:
-                break
-
-            ack_ids = [msg.ack_id for msg in response.received_messages]
-            subscriber.acknowledge(
-                request={"subscription": subscription_path, "ack_ids": ack_ids}
-            )
-            count += len(ack_ids)
+    try:
+        subscriber = get_subscriber()
+        subscription_path = get_subscription_path(project_id, subscription_name)
+
+        # The client batches acks for the stream, so the backlog drains at wire speed
+        streaming_pull = subscriber.subscribe(
+            subscription_path,
+            callback=drain,
+            flow_control=pubsub_v1.types.FlowControl(max_messages=1000),
+        )
+        try:
+            while time.monotonic() - last_received < idle_timeout:
+                time.sleep(0.1)
+        finally:
+            streaming_pull.cancel()
+            streaming_pull.result()
     except Exception:
         pass
 
@@ -199,12 +357,20 @@ if __name__ == "__main__":
 
     # Get public key
     key_parser = subparsers.add_parser("get-public-key", help="Get test public key hex")
+    key_parser.add_argument("--verbose", action="store_true", help="Print sign backend")
 
     # Sign request
     sign_parser = subparsers.add_parser("sign", help="Sign a request body")
     sign_parser.add_argument("--body", required=True, help="Request body (JSON)")
     sign_parser.add_argument("--timestamp", help="Timestamp (default: current time)")
 
+    # Sign a stream of request bodies in one process
+    stream_parser = subparsers.add_parser(
+        "sign-stream",
+        help="Sign base64 request bodies from stdin, one per line (prints "
+        "'<signature> <timestamp>' per line, or 'error <reason>' for invalid base64)",
+    )
+
     # Create ping request
     ping_parser = subparsers.add_parser(
         "create-ping", help="Create signed ping request"
@@ -216,6 +382,20 @@ if __name__ == "__main__":
     )
     slash_parser.add_argument("--name", default="test-command", help="Command name")
 
+    # Create many signed slash command requests
+    batch_parser = subparsers.add_parser(
+        "batch-sign",
+        help="Create many signed slash command requests (JSON lines). All share one "
+        "timestamp, which services reject once it is 6 or more seconds old",
+    )
+    batch_parser.add_argument(
+        "--count", type=int, required=True, help="Number of requests"
+    )
+    batch_parser.add_argument(
+        "--name", default="test-command", help="Command name prefix"
+    )
+    batch_parser.add_argument("--timestamp", help="Timestamp (default: current time)")
+
     # Setup Pub/Sub
     setup_parser = subparsers.add_parser(
         "setup-pubsub", help="Setup Pub/Sub topic and subscription"
@@ -243,6 +423,12 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
+    # Bulk signing commands report the backend so a run shows which signer it used
+    if args.command in ("batch-sign", "sign-stream") or (
+        args.command == "get-public-key" and args.verbose
+    ):
+        print(f"sign backend: {_sign_backend()[0]}", file=sys.stderr)
+
     if args.command == "get-public-key":
         _, public_key = get_test_keys()
         print(public_key)
@@ -252,6 +438,21 @@ if __name__ == "__main__":
         sig, ts = sign_request(body, args.timestamp)
         print(json.dumps({"signature": sig, "timestamp": ts}))
 
+    elif args.command == "sign-stream":
+        # Persistent mode: drive via pipes to pay interpreter startup once per run
+        for line in sys.stdin:
+            # A blank line is the base64 of an empty body, so it gets signed too
+            line = line.strip()
+            try:
+                body = base64.b64decode(line, validate=True)
+            except binascii.Error as e:
+                # Keep the process alive and the output in step with the input
+                sys.stdout.write(f"error invalid base64: {e}\n")
+            else:
+                sig, ts = sign_request(body)
+                sys.stdout.write(f"{sig} {ts}\n")
+            sys.stdout.flush()
+
     elif args.command == "create-ping":
         body = create_ping_request()
         sig, ts = sign_request(body)
@@ -262,6 +463,16 @@ if __name__ == "__main__":
         sig, ts = sign_request(body)
         print(json.dumps({"body": body.decode(), "signature": sig, "timestamp": ts}))
 
+    elif args.command == "batch-sign":
+        bodies = [
+            create_slash_command_request(f"{args.name}-{i}") for i in range(args.count)
+        ]
+        for body, (sig, ts) in zip(bodies, sign_many(bodies, args.timestamp)):
+            sys.stdout.write(
+                json.dumps({"body": body.decode(), "signature": sig, "timestamp": ts})
+                + "\n"
+            )
+
     elif args.command == "setup-pubsub":
         success = setup_pubsub(args.project, args.topic, args.subscription)
         sys.exit(0 if success else 1)
@@ -10,3 +10,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "discord_webhook.settings")
 
 application = get_wsgi_application()
+
+# Initialize configuration when the worker loads, not on the first request
+from . import views  # noqa: E402
+
+views.init_config()